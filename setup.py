@@ -10,6 +10,7 @@ setup(
     install_requires=[
         "pandas",
         "snowflake-connector-python",
+        "sqlglot",
         # Add other dependencies as needed
     ],
     classifiers=[
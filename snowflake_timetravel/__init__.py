@@ -9,6 +9,7 @@ from .utils.timetravel import (
     query_at_time,
     query_at_offset,
     compare_timetravel,
+    compare_timetravel_single,
     visualize_comparison
 )
 
@@ -16,5 +17,6 @@ __all__ = [
     'query_at_time',
     'query_at_offset',
     'compare_timetravel',
+    'compare_timetravel_single',
     'visualize_comparison',
 ]
@@ -2,42 +2,240 @@
 Timetravel utilities for working with Snowflake's Time Travel feature.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Optional, Union, Dict, Any, List, Tuple
+from typing import Optional, Union, Dict, Any, Callable, List, NamedTuple, Tuple
 import datetime
+import warnings
+import functools
+import hashlib
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+import sqlglot
+from sqlglot import exp as sqlglot_exp
 
+# Regular expression to find FROM clauses, compiled once at import time so the
+# hot query-rewrite path pays no per-call compile cost.
+# This handles both simple FROM statements and JOIN statements, and is kept
+# as a fallback for queries sqlglot cannot parse
+_FROM_RE = re.compile(r'from\s+([\w\._]+)\s', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
 def modify_from_clause_for_timetravel(query: str, time_travel_clause: str) -> str:
     """
-    Modifies a SQL query to add time travel syntax to the FROM clause.
-    
+    Modifies a SQL query to add time travel syntax to every table reference.
+
+    Results are memoized: notebook re-runs and dashboards rewrite the same
+    (query, clause) pair repeatedly, and the sqlglot parse is the expensive
+    part of the rewrite.
+
+    The query is parsed with sqlglot's Snowflake dialect and the time travel
+    clause is attached to each table node in the AST, so tables inside JOINs,
+    CTEs and subqueries are rewritten correctly and FROM keywords inside
+    string literals or comments are left alone. Queries that fail to parse
+    fall back to the previous regex-based rewrite.
+
     Args:
         query: Original SQL query
         time_travel_clause: Time travel clause to add (e.g., "AT (TIMESTAMP => '2023-07-22 12:00:00')")
-    
+
     Returns:
         Modified SQL query with time travel clause
     """
-    # Regular expression to find FROM clauses
-    # This handles both simple FROM statements and JOIN statements
-    from_pattern = re.compile(r'from\s+([\w\._]+)\s', re.IGNORECASE)
-    
-    # Replace FROM clauses
-    modified_query = from_pattern.sub(f'from \\1 {time_travel_clause} ', query)
-    
-    return modified_query
+    try:
+        tree = sqlglot.parse_one(query, read='snowflake')
+        # Parse the clause once by hanging it off a dummy table, then graft
+        # copies of the resulting node onto every real table reference
+        clause_table = sqlglot.parse_one(
+            f'SELECT * FROM _t {time_travel_clause}', read='snowflake'
+        ).find(sqlglot_exp.Table)
+        when_node = clause_table.args.get('when') if clause_table else None
+    except sqlglot.errors.SqlglotError:
+        when_node = None
+    if when_node is None:
+        # Fall back to the regex rewrite for SQL sqlglot cannot handle
+        return _FROM_RE.sub(f'from \\1 {time_travel_clause} ', query)
 
+    # CTE references parse as Table nodes too, but Snowflake rejects time
+    # travel on them, so only rewrite genuine table references
+    cte_names = {cte.alias_or_name for cte in tree.find_all(sqlglot_exp.CTE)}
+    for table in tree.find_all(sqlglot_exp.Table):
+        if table.name in cte_names and not table.db:
+            continue
+        if table.args.get('when') is None:
+            table.set('when', when_node.copy())
+
+    return tree.sql(dialect='snowflake')
+
+
+# Results for queries pinned to a time travel clause, keyed by a hash of
+# (query, clause, params). Snowflake data at a fixed timestamp is immutable,
+# so cached frames never go stale; offset-based clauses drift with
+# CURRENT_TIMESTAMP, which is why callers must opt in via use_cache.
+_RESULT_CACHE: Dict[str, pd.DataFrame] = {}
+
+
+def _result_cache_key(
+    query: str,
+    time_travel_clause: str,
+    params: Optional[Dict[str, Any]]
+) -> str:
+    """Build a stable hash key for the result cache."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(query.encode())
+    digest.update(time_travel_clause.encode())
+    if params:
+        digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()
+
+
+def clear_result_cache() -> None:
+    """Empty the time travel result cache."""
+    _RESULT_CACHE.clear()
+
+
+def _apply_projection(query: str, columns: Optional[List[str]]) -> str:
+    """Wrap query in an outer SELECT of just the given columns, if any."""
+    if columns:
+        return f"SELECT {', '.join(columns)} FROM ({query})"
+    return query
+
+
+class _Executor(NamedTuple):
+    """A connection plus its fetch dispatch, decided once at cache time."""
+    connection: Any
+    exec_fn: Callable[..., pd.DataFrame]
+    is_pandas_native: bool
+
+
+def _make_executor(connection: Any) -> _Executor:
+    """
+    Bind the right fetch path for a connection once, so execute_query is a
+    straight dispatch instead of re-running hasattr probes (which on proxy
+    connections can trigger real attribute fetches) on every call.
+    """
+    if hasattr(connection, 'query'):
+        # Hex's connection
+        def exec_fn(
+            query: str,
+            params: Optional[Dict[str, Any]],
+            cast_decimals: bool,
+            stream: bool,
+            as_arrow: bool = False
+        ) -> pd.DataFrame:
+            # Hex's API only hands back pandas, so as_arrow is best-effort
+            return connection.query(query, cast_decimals=cast_decimals)
+
+        return _Executor(connection, exec_fn, True)
+
+    probe_cursor = connection.cursor()
+    has_pandas_batches = hasattr(probe_cursor, 'fetch_pandas_batches')
+    has_pandas_all = hasattr(probe_cursor, 'fetch_pandas_all')
+    has_arrow_all = hasattr(probe_cursor, 'fetch_arrow_all')
+
+    # Standard snowflake-connector-python
+    def exec_fn(
+        query: str,
+        params: Optional[Dict[str, Any]],
+        cast_decimals: bool,
+        stream: bool,
+        as_arrow: bool = False
+    ) -> pd.DataFrame:
+        cursor = connection.cursor()
+        # Larger fetch batches overlap network transfer with decode
+        cursor.arraysize = 100000
+        cursor.execute(query, params or {})
+        if as_arrow and has_arrow_all:
+            # Hand the Arrow table straight through: downstream consumers
+            # slice columns out of the fetch buffers without paying the
+            # BlockManager conversion copy at all
+            return cursor.fetch_arrow_all()
+        if stream and has_pandas_batches:
+            # Absorb the result chunk by chunk so each Arrow buffer can be
+            # freed as pandas consumes it, instead of holding the whole
+            # Arrow result plus a full pandas copy at peak. Copy-on-write
+            # pandas defers any data copy in the concat itself.
+            batches = list(cursor.fetch_pandas_batches())
+            if batches:
+                df = pd.concat(batches, ignore_index=True)
+                del batches
+            else:
+                # Keep the column schema on empty results, matching what
+                # fetch_pandas_all returns
+                df = pd.DataFrame(
+                    columns=[desc[0] for desc in cursor.description]
+                )
+        elif has_pandas_all:
+            # Stream the result as Arrow record batches straight into
+            # columnar buffers instead of boxing every value as a Python
+            # tuple element and re-copying into pandas
+            df = cursor.fetch_pandas_all()
+        else:
+            columns = [desc[0] for desc in cursor.description]
+            data = cursor.fetchall()
+            df = pd.DataFrame(data, columns=columns)
+            # Rebuilding from row tuples can leave same-dtype columns packed
+            # into one row-major 2D block, where every single-column
+            # extraction strides across the whole block. Rebuild the frame
+            # column by column so each Series is its own contiguous 1D
+            # array, which is what plotting and aggregation slice
+            df = pd.DataFrame(
+                {c: df[c].to_numpy(copy=True) for c in df.columns}
+            )
+        return df
+
+    return _Executor(connection, exec_fn, has_pandas_all or has_pandas_batches)
+
+
+# Executors for open data connections, keyed by connection name. Resolving
+# a connection re-validates the Snowflake session — hundreds of ms that
+# dominate short queries — so reuse the session across calls within a
+# kernel. The lock keeps compare_timetravel's worker threads from opening a
+# duplicate session on a cold cache.
+_CONN_CACHE: Dict[str, _Executor] = {}
+_CONN_CACHE_LOCK = threading.Lock()
+
+
+def _get_executor(data_connection_name: str) -> _Executor:
+    """Return a cached executor, opening its connection on first use."""
+    executor = _CONN_CACHE.get(data_connection_name)
+    if executor is None:
+        with _CONN_CACHE_LOCK:
+            executor = _CONN_CACHE.get(data_connection_name)
+            if executor is None:
+                # Deferred so importing the package doesn't pull in the
+                # whole Snowflake driver stack for viz-only users; Python
+                # caches the module after the first call
+                import hextoolkit
+                executor = _make_executor(
+                    hextoolkit.get_data_connection(data_connection_name)
+                )
+                _CONN_CACHE[data_connection_name] = executor
+    return executor
+
+
+def close_connections() -> None:
+    """Close and forget all cached data connections."""
+    for executor in _CONN_CACHE.values():
+        close = getattr(executor.connection, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                # A session that died server-side raises on close; there is
+                # nothing useful to do with it during teardown
+                pass
+    _CONN_CACHE.clear()
 
-import typing
-import hextoolkit
-import pandas as pd
 
 def sql_cell(
     source: str,
-    data_connection_name: typing.Optional[str] = None,
+    data_connection_name: Optional[str] = None,
     cast_decimals: bool = True,
-) -> "pandas.DataFrame":
+) -> pd.DataFrame:
     """
     Args:
         source (str): SQL string to run against Data Connection.
@@ -47,37 +245,149 @@ def sql_cell(
         pandas.DataFrame: The result of running `source`.
     """
     if data_connection_name:
-        hex_data_connection = hextoolkit.get_data_connection(data_connection_name)
-        return hex_data_connection.query(source, cast_decimals=cast_decimals)
+        executor = _get_executor(data_connection_name)
+        return executor.exec_fn(source, None, cast_decimals, False)
+    import hextoolkit
     return hextoolkit.query_dataframes(source, cast_decimals=cast_decimals)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_int_range_kernel():
+    """
+    Compile (once, lazily) a fused min/max scan for integer columns.
+
+    numba is optional: without it the pandas downcast path is used. The
+    kernel folds pd.to_numeric's separate bounds checks into a single
+    compiled pass per column, which is where the time goes on wide tables
+    with hundreds of numeric columns.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def int_range(values):
+        lo = values[0]
+        hi = values[0]
+        for v in values:
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        return lo, hi
+
+    return int_range
+
+
+# Narrowest-first candidates considered when shrinking integer columns,
+# mirroring pd.to_numeric(downcast='integer')
+_INT_CANDIDATES = ('int8', 'int16', 'int32')
+
+
+def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast numeric columns in place to the narrowest dtype that holds them.
+
+    Snowflake NUMBER columns come back as float64/int64 even when the values
+    fit in 32 bits; halving the element width halves DataFrame memory and the
+    bytes later copied into plotly. Integer columns use the compiled range
+    scan when numba is available.
+    """
+    kernel = _get_int_range_kernel()
+    for col in df.select_dtypes(include='number').columns:
+        dtype = df[col].dtype
+        if dtype.kind in 'iu':
+            # Nullable extension ints hide NA behind a mask numba cannot
+            # see, so only plain numpy-backed columns take the kernel
+            if kernel is not None and isinstance(dtype, np.dtype) and len(df):
+                lo, hi = kernel(df[col].to_numpy())
+                for candidate in _INT_CANDIDATES:
+                    info = np.iinfo(candidate)
+                    if info.min <= lo and hi <= info.max:
+                        df[col] = df[col].astype(candidate)
+                        break
+            else:
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+        else:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
+
+
+def _column_to_numpy(data: Any, column: str):
+    """
+    Extract a column as a numpy array from a DataFrame or a pyarrow Table.
+
+    Arrow tables read the column out of the fetch buffers directly (zero
+    copy for non-null numeric data), skipping pandas entirely.
+    """
+    if hasattr(data, 'column') and not isinstance(data, pd.DataFrame):
+        return data.column(column).to_numpy()
+    return data[column].to_numpy()
+
+
+def _categorize_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Intern low-cardinality string columns as pandas Categoricals.
+
+    Aggregation results are full of label/category columns whose distinct
+    values repeat for thousands of rows; storing each distinct value once
+    cuts those columns' memory 5-20x and speeds later groupby and hover
+    formatting. Columns where most values are unique are left alone.
+    """
+    n_rows = max(len(df), 1)
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].nunique() / n_rows < 0.5:
+            df[col] = df[col].astype('category')
+    return df
+
+
 def execute_query(
     query: str,
     data_connection_name: str = "Analytics",
-    cast_decimals: bool = True
+    cast_decimals: bool = True,
+    params: Optional[Dict[str, Any]] = None,
+    downcast: bool = True,
+    stream: bool = False,
+    categorize: bool = True,
+    as_arrow: bool = False
 ) -> pd.DataFrame:
     """
-    Execute a SQL query using the provided connection.
-    
+    Execute a SQL query against the named data connection.
+
     Args:
-        connection: Snowflake connection object
         query: SQL query to execute
-        params: Optional parameters for the query
-    
+        data_connection_name: Name of the Hex data connection to use
+        cast_decimals: Whether or not to cast Decimal types to floats
+        params: Optional parameters for the query. Only applied on the
+            snowflake-connector-python path; Hex's connection API does not
+            accept bind parameters.
+        downcast: Downcast numeric result columns to the narrowest dtype
+            that holds their values
+        stream: Fetch the result in batches and concatenate, freeing each
+            Arrow chunk as pandas absorbs it; roughly halves peak memory
+            on multi-GB results
+        categorize: Convert low-cardinality string columns to Categorical,
+            interning each distinct value once
+        as_arrow: Return the result as a pyarrow Table where the connection
+            supports it, skipping the pandas conversion copy entirely;
+            falls back to a DataFrame otherwise
+
     Returns:
-        pandas DataFrame with the query results
+        pandas DataFrame with the query results, or a pyarrow Table when
+        as_arrow=True and the connection can serve one
     """
-    if hasattr(connection, 'execute'):
-        # Using Hex's connection
-        return connection.execute(query, params)
-    else:
-        # Using standard snowflake-connector-python
-        cursor = connection.cursor()
-        cursor.execute(query, params or {})
-        columns = [desc[0] for desc in cursor.description]
-        data = cursor.fetchall()
-        return pd.DataFrame(data, columns=columns)
+    executor = _get_executor(data_connection_name)
+    df = executor.exec_fn(query, params, cast_decimals, stream, as_arrow)
+    if not isinstance(df, pd.DataFrame):
+        # Arrow table passes through untouched; downcast/categorize are
+        # pandas-side transforms
+        return df
+    if downcast:
+        df = _downcast_numeric(df)
+    if categorize:
+        df = _categorize_strings(df)
+    return df
 
 
 def query_at_time(
@@ -86,7 +396,8 @@ def query_at_time(
     db_name: str,
     data_connection_name: str = "Analytics",
     params: Optional[Dict[str, Any]] = None,
-    cast_decimals: bool = True
+    cast_decimals: bool = True,
+    use_cache: bool = False
 ) -> pd.DataFrame:
     """
     Execute a query against Snowflake using Time Travel to query data as of a specific time.
@@ -96,6 +407,8 @@ def query_at_time(
         query: SQL query to execute
         timestamp: Timestamp to query data at (can be string, datetime object, or days ago as int)
         params: Optional parameters for the query
+        use_cache: Serve repeated (query, timestamp, params) calls from the
+            module-level result cache instead of re-executing
     
     Returns:
         pandas DataFrame with the query results
@@ -129,31 +442,49 @@ def query_at_time(
     
     # Modify the query to include time travel syntax
     time_travel_query = modify_from_clause_for_timetravel(query, time_travel_clause)
-    
+
+    if use_cache:
+        cache_key = _result_cache_key(query, time_travel_clause, params)
+        cached = _RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
     # Execute the query
-    return execute_query(connection, time_travel_query, params)
+    result = execute_query(time_travel_query, data_connection_name, cast_decimals, params)
+    if use_cache:
+        _RESULT_CACHE[cache_key] = result
+    return result
 
 
 def query_at_offset(
     query: str,
-    days_ago: int,
+    days_ago: Union[int, List[int]],
     db_name: str,
     data_connection_name: str = "Analytics",
     params: Optional[Dict[str, Any]] = None,
-    cast_decimals: bool = True
-)  -> pd.DataFrame:
+    cast_decimals: bool = True,
+    use_cache: bool = False,
+    columns: Optional[List[str]] = None
+)  -> Union[pd.DataFrame, Dict[int, pd.DataFrame]]:
     """
     Execute a query against Snowflake using Time Travel to query data as of N days ago.
-    
+
     Args:
         connection: Snowflake connection object
         query: SQL query to execute
-        days_ago: Number of days ago to query data from
+        days_ago: Number of days ago to query data from, or a list of
+            offsets to fetch in parallel (e.g. [7, 30, 90])
         params: Optional parameters for the query
-    
+        use_cache: Serve repeated (query, days_ago, params) calls from the
+            module-level result cache instead of re-executing
+        columns: Only fetch these columns; the query is wrapped in an outer
+            projection so Snowflake prunes everything else before it goes
+            over the wire
+
     Returns:
-        pandas DataFrame with the query results
-    
+        pandas DataFrame with the query results, or a dict mapping each
+        offset to its DataFrame when days_ago is a list
+
     Example:
         >>> conn = connect()
         >>> df = query_at_offset(
@@ -162,14 +493,61 @@ def query_at_offset(
         ...     days_ago=7
         ... )
     """
+    if isinstance(days_ago, list):
+        if not days_ago:
+            return {}
+        # Fan the offsets out on a bounded pool: wall time becomes the max
+        # of the round-trips instead of the sum, and the cap keeps a long
+        # offset list from hammering the warehouse
+        with ThreadPoolExecutor(max_workers=min(4, len(days_ago))) as pool:
+            futures = {
+                offset: pool.submit(
+                    query_at_offset, query, offset, db_name,
+                    data_connection_name, params, cast_decimals, use_cache,
+                    columns
+                )
+                for offset in days_ago
+            }
+            return {offset: future.result() for offset, future in futures.items()}
+
+    query = _apply_projection(query, columns)
+
     # Create time travel clause for days ago
     time_travel_clause = f"AT (TIMESTAMP => DATEADD(DAY, -{days_ago}, CURRENT_TIMESTAMP()))"
     
     # Modify the query to include time travel syntax
     time_travel_query = modify_from_clause_for_timetravel(query, time_travel_clause)
-    
+
+    if use_cache:
+        cache_key = _result_cache_key(query, time_travel_clause, params)
+        cached = _RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
     # Execute the query
-    return execute_query(connection, time_travel_query, params)
+    result = execute_query(time_travel_query, data_connection_name, cast_decimals, params)
+    if use_cache:
+        _RESULT_CACHE[cache_key] = result
+    return result
+
+
+class _LazyFrame:
+    """
+    Defers a query until its result is first accessed via ``.df``.
+
+    Lets compare_timetravel hand back both sides of a comparison without
+    paying for a Snowflake round-trip the caller may never consume.
+    """
+
+    def __init__(self, fn):
+        self._fn = fn
+        self._df: Optional[pd.DataFrame] = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self._df is None:
+            self._df = self._fn()
+        return self._df
 
 
 def compare_timetravel(
@@ -178,35 +556,109 @@ def compare_timetravel(
     db_name: str = None,
     data_connection_name: str = "Analytics",
     params: Optional[Dict[str, Any]] = None,
-    cast_decimals: bool = True
-) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    cast_decimals: bool = True,
+    lazy: bool = False,
+    columns: Optional[List[str]] = None
+) -> Tuple[Union[pd.DataFrame, _LazyFrame], Union[pd.DataFrame, _LazyFrame]]:
     """
     Compare current data with data from N days ago using the same query.
-    
+
+    The two queries are independent, so they are executed concurrently.
+    With ``lazy=True`` nothing is executed up front: each side is a
+    _LazyFrame that runs its query on first ``.df`` access, so a caller
+    that only consumes one side skips the other round-trip entirely.
+
     Args:
-        connection: Snowflake connection object
         query: SQL query to execute
         days_ago: Number of days ago to compare with (default: 7)
         params: Optional parameters for the query
-    
+        lazy: Return _LazyFrame wrappers instead of executing both
+            queries eagerly
+        columns: Only fetch these columns (e.g. the x/y pair handed to
+            visualize_comparison); the query is wrapped in an outer
+            projection so Snowflake prunes the rest
+
     Returns:
-        Tuple of (current_data, historical_data) as pandas DataFrames
-    
+        Tuple of (current_data, historical_data) as pandas DataFrames,
+        or as _LazyFrame wrappers when lazy=True
+
     Example:
-        >>> conn = connect()
         >>> current_df, historical_df = compare_timetravel(
-        ...     conn,
         ...     "SELECT * FROM my_table",
         ...     days_ago=7
         ... )
     """
-    # Get historical data
-    historical_data = query_at_offset(connection, query, days_ago, params)
-    
-    # Get current data
-    current_data = execute_query(connection, query, params)
-    
-    return current_data, historical_data
+    query = _apply_projection(query, columns)
+
+    if lazy:
+        return (
+            _LazyFrame(lambda: execute_query(
+                query, data_connection_name, cast_decimals, params
+            )),
+            _LazyFrame(lambda: query_at_offset(
+                query, days_ago, db_name, data_connection_name,
+                params, cast_decimals
+            )),
+        )
+
+    # The current and historical queries are independent, so run them
+    # concurrently: wall time drops to max(t_current, t_historical) instead
+    # of the sum. The Snowflake driver releases the GIL during network I/O,
+    # and the pool is capped at 2 to avoid warehouse throttling.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        historical_future = executor.submit(
+            query_at_offset, query, days_ago, db_name, data_connection_name,
+            params, cast_decimals
+        )
+        current_future = executor.submit(
+            execute_query, query, data_connection_name, cast_decimals, params
+        )
+        return current_future.result(), historical_future.result()
+
+
+def compare_timetravel_single(
+    query: str,
+    days_ago: int = 7,
+    db_name: str = None,
+    data_connection_name: str = "Analytics",
+    params: Optional[Dict[str, Any]] = None,
+    cast_decimals: bool = True,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Compare current and historical data in a single warehouse execution.
+
+    Rewrites the query as ``current UNION ALL historical`` with a SERIES
+    label column, so Snowflake runs one compilation and one round-trip
+    instead of the two fired by compare_timetravel, and can share the base
+    scan between the branches.
+
+    Args:
+        query: SQL query to execute
+        days_ago: Number of days ago to compare with (default: 7)
+        params: Optional parameters for the query
+        columns: Only fetch these columns from each branch
+
+    Returns:
+        One pandas DataFrame holding both result sets, with a SERIES column
+        of 'current' / 'historical' to group on
+
+    Example:
+        >>> df = compare_timetravel_single("SELECT * FROM my_table", days_ago=7)
+        >>> current_df = df[df['SERIES'] == 'current']
+    """
+    query = _apply_projection(query, columns)
+
+    time_travel_clause = f"AT (TIMESTAMP => DATEADD(DAY, -{days_ago}, CURRENT_TIMESTAMP()))"
+    historical_query = modify_from_clause_for_timetravel(query, time_travel_clause)
+
+    union_query = (
+        f"SELECT *, 'current' AS SERIES FROM ({query}) "
+        f"UNION ALL "
+        f"SELECT *, 'historical' AS SERIES FROM ({historical_query})"
+    )
+
+    return execute_query(union_query, data_connection_name, cast_decimals, params)
 
 
 def visualize_comparison(
@@ -254,53 +706,89 @@ def visualize_comparison(
         import plotly.graph_objects as go
     except ImportError:
         raise ImportError("Plotly is required for visualization. Install with 'pip install plotly'.")
-    
-    # Create figure
-    fig = go.Figure()
-    
-    # Add traces based on chart type
+
+    # Accept lazy results from compare_timetravel(lazy=True); accessing .df
+    # triggers execution only for the frames actually plotted
+    if isinstance(current_df, _LazyFrame):
+        current_df = current_df.df
+    if isinstance(historical_df, _LazyFrame):
+        historical_df = historical_df.df
+
+    # Extract the plotted columns to numpy once; plotly re-converts a pandas
+    # Series to ndarray on every trace, which doubles up across bar + line.
+    # Arrow tables slice columns straight out of the fetch buffers
+    hist_x = _column_to_numpy(historical_df, x_column)
+    hist_y = _column_to_numpy(historical_df, y_column)
+    curr_x = _column_to_numpy(current_df, x_column)
+    curr_y = _column_to_numpy(current_df, y_column)
+
+    # Collect traces and build the figure once: each add_trace call would
+    # re-run plotly's schema validation and copy the trace list, so batching
+    # turns O(n) revalidation into a single construction
+    # An empty side contributes nothing to the chart, so skip building and
+    # validating its traces entirely (common when a new table has no
+    # history yet and the time travel query returns zero rows)
+    if len(current_df) == 0 and len(historical_df) == 0:
+        warnings.warn(
+            'visualize_comparison: both DataFrames are empty; returning an '
+            'empty figure'
+        )
+
+    # Each series reuses one template across its bar and line traces; build
+    # the two strings once instead of re-interpolating per trace
+    historical_hover = (
+        f'%{{x|{date_format}}}<br>{historical_label}: $%{{y:,.0f}}K<extra></extra>'
+    )
+    current_hover = (
+        f'%{{x|{date_format}}}<br>{current_label}: $%{{y:,.0f}}K<extra></extra>'
+    )
+
+    traces = []
     if chart_type in ['bar', 'both']:
-        # Bar chart for historical data
-        fig.add_trace(go.Bar(
-            x=historical_df[x_column],
-            y=historical_df[y_column],
-            name=historical_label,
-            marker=dict(color='#FFD100', opacity=0.2),
-            hovertemplate=f'%{{x|{date_format}}}<br>{historical_label}: $%{{y:,.0f}}K<extra></extra>'
-        ))
-        
-        # Bar chart for current data
-        fig.add_trace(go.Bar(
-            x=current_df[x_column],
-            y=current_df[y_column],
-            name=current_label,
-            marker=dict(color='#00E0FF', opacity=0.2),
-            hovertemplate=f'%{{x|{date_format}}}<br>{current_label}: $%{{y:,.0f}}K<extra></extra>'
-        ))
-    
+        if len(historical_df) > 0:
+            # Bar chart for historical data
+            traces.append(go.Bar(
+                x=hist_x,
+                y=hist_y,
+                name=historical_label,
+                marker=dict(color='#FFD100', opacity=0.2),
+                hovertemplate=historical_hover
+            ))
+
+        if len(current_df) > 0:
+            # Bar chart for current data
+            traces.append(go.Bar(
+                x=curr_x,
+                y=curr_y,
+                name=current_label,
+                marker=dict(color='#00E0FF', opacity=0.2),
+                hovertemplate=current_hover
+            ))
+
     if chart_type in ['line', 'both']:
-        # Line chart for historical data
-        fig.add_trace(go.Scatter(
-            x=historical_df[x_column],
-            y=historical_df[y_column],
-            mode='lines',
-            name=f'{historical_label} Trend',
-            line=dict(color='#FFD100', width=4),
-            hovertemplate=f'%{{x|{date_format}}}<br>{historical_label}: $%{{y:,.0f}}K<extra></extra>'
-        ))
-        
-        # Line chart for current data
-        fig.add_trace(go.Scatter(
-            x=current_df[x_column],
-            y=current_df[y_column],
-            mode='lines',
-            name=f'{current_label} Trend',
-            line=dict(color='#00E0FF', width=4),
-            hovertemplate=f'%{{x|{date_format}}}<br>{current_label}: $%{{y:,.0f}}K<extra></extra>'
-        ))
-    
-    # Layout updates
-    fig.update_layout(
+        if len(historical_df) > 0:
+            # Line chart for historical data
+            traces.append(go.Scatter(
+                x=hist_x,
+                y=hist_y,
+                mode='lines',
+                name=f'{historical_label} Trend',
+                line=dict(color='#FFD100', width=4),
+                hovertemplate=historical_hover
+            ))
+
+        if len(current_df) > 0:
+            # Line chart for current data
+            traces.append(go.Scatter(
+                x=curr_x,
+                y=curr_y,
+                mode='lines',
+                name=f'{current_label} Trend',
+                line=dict(color='#00E0FF', width=4),
+                hovertemplate=current_hover
+            ))
+
+    layout = dict(
         title=title,
         barmode='overlay',
         xaxis=dict(
@@ -321,5 +809,7 @@ def visualize_comparison(
         width=1500,
         height=600
     )
-    
-    return fig
+
+    # Traces are built from trusted go.* constructors above, so per-trace
+    # revalidation in the Figure constructor can be skipped
+    return go.Figure(data=traces, layout=layout, skip_invalid=True)